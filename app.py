@@ -1,18 +1,39 @@
 import os
+import logging
 import threading
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
+from flask_compress import Compress
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import orjson
 import time
+from operator import itemgetter
+from bisect import bisect_left
+from functools import lru_cache
 from datetime import datetime
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from cachetools import TTLCache
 import base64  # for screenshot logging
 
 load_dotenv()
 
+logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s')
+log = logging.getLogger('edge')
+try:
+    log.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+except ValueError:
+    log.setLevel(logging.INFO)
+    log.warning("⚠️ Unknown LOG_LEVEL %r → using INFO", os.getenv('LOG_LEVEL'))
+
 app = Flask(__name__)
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_LEVEL'] = 6
 CORS(app)
+Compress(app)
 
 # ==========================================
 # CONFIG
@@ -21,19 +42,28 @@ ETHERSCAN_API_KEY = os.getenv('ETHERSCAN_API_KEY')
 CMC_API_KEY = os.getenv('CMC_API_KEY')
 
 if not ETHERSCAN_API_KEY:
-    print("⚠️ ETHERSCAN_API_KEY missing → whale tracking disabled")
+    log.warning("⚠️ ETHERSCAN_API_KEY missing → whale tracking disabled")
 if not CMC_API_KEY:
-    print("⚠️ CMC_API_KEY missing → using CoinGecko fallback")
+    log.warning("⚠️ CMC_API_KEY missing → using CoinGecko fallback")
 
 ETHERSCAN_URL = 'https://api.etherscan.io/api'
 CMC_URL = 'https://pro-api.coinmarketcap.com'
 
 REQUESTS_PER_SECOND = 2
-request_times = deque(maxlen=REQUESTS_PER_SECOND * 2)
 
+PRICE_TTL = 30
+WHALE_TTL = 300
+FUNDING_TTL = 30
+COIN_TTL = 20
+
+# TTLCache is not thread-safe; hold cache_lock for every read and write
+cache_lock = threading.Lock()
 cache = {
-    'whale_transactions': {},
-    'prices': {},
+    'whale_transactions': TTLCache(maxsize=256, ttl=WHALE_TTL),
+    'prices': TTLCache(maxsize=1024, ttl=PRICE_TTL),
+    'price_misses': TTLCache(maxsize=1024, ttl=PRICE_TTL),
+    'funding': TTLCache(maxsize=1, ttl=FUNDING_TTL),
+    'coins': TTLCache(maxsize=128, ttl=COIN_TTL),
 }
 
 TOKEN_ADDRESSES = {
@@ -46,6 +76,11 @@ TOKEN_ADDRESSES = {
     'WBTC': '0x2260fac5e5542a773aa44fbcfedf7c193bc2c599',
     'DAI': '0x6b175474e89094c44da98b954eedeac495271d0f',
 }
+# 10**d for every ERC-20 decimals value, indexed by the tx's tokenDecimal
+POW10 = 10.0 ** np.arange(37)
+
+# symbols are uppercased once at request entry; everything below assumes that
+TOKEN_SYMBOLS = frozenset(TOKEN_ADDRESSES)
 
 COIN_SYMBOLS = [
     'BTC', 'ETH', 'BNB', 'SOL', 'XRP', 'ADA', 'DOGE', 'AVAX', 'MATIC', 'LINK',
@@ -56,35 +91,95 @@ COIN_SYMBOLS = [
     'MKR', 'RAY', 'PENDLE', 'STRK', 'FET', 'TAO', 'ARKM', 'IMX', 'RNDR'
 ]
 
-data_lock = threading.Lock()
-
-def wait_for_rate_limit():
-    now = time.time()
-    with data_lock:
-        while len(request_times) >= REQUESTS_PER_SECOND:
-            oldest = request_times[0]
-            if now - oldest < 1:
-                time.sleep(1 - (now - oldest) + 0.1)
-            else:
-                request_times.popleft()
-        request_times.append(now)
+SCAN_WORKERS = 16
+scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+
+# separate pool: shards are submitted from inside scan workers
+WHALE_SHARDS = 4
+etherscan_executor = ThreadPoolExecutor(max_workers=WHALE_SHARDS)
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                sleep_for = (1 - self.tokens) / self.rate
+            # sleep outside the lock so other workers can refill/consume
+            time.sleep(sleep_for)
+
+rate_limiter = TokenBucket(REQUESTS_PER_SECOND, REQUESTS_PER_SECOND)
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second):
+    return datetime.fromtimestamp(second).isoformat()
+
+def now_iso():
+    # one datetime/isoformat per wall-clock second, shared by every coin in a scan
+    return _iso_for_second(int(time.time()))
+
+def make_session():
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        # no 429 / Retry-After here: adapter retries bypass rate_limiter, which owns throttling
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            respect_retry_after_header=False
+        )
+    )
+    s.mount('https://', adapter)
+    return s
 
 # ==========================================
 # FREE BINANCE FUNDING
 # ==========================================
-def get_binance_funding(symbol):
+binance_session = make_session()
+# serializes the premiumIndex fetch so concurrent scan workers share one request
+funding_fetch_lock = threading.Lock()
+
+def _fetch_all_funding():
     try:
-        url = f"https://fapi.binance.com/fapi/v1/premiumIndex?symbol={symbol}USDT"
-        r = requests.get(url, timeout=5)
+        r = binance_session.get("https://fapi.binance.com/fapi/v1/premiumIndex", timeout=5)
         r.raise_for_status()
-        d = r.json()
-        if 'lastFundingRate' in d:
-            rate = float(d['lastFundingRate']) * 100
-            print(f"✅ Binance funding: {symbol} = {rate:.4f}%")
-            return rate
+        rates = {
+            row['symbol'][:-4]: float(row['lastFundingRate']) * 100
+            for row in r.json()
+            if row['symbol'].endswith('USDT') and row.get('lastFundingRate')
+        }
+        log.debug("✅ Binance funding: %d USDT perps", len(rates))
+        return rates
     except Exception as e:
-        print(f"Binance funding failed for {symbol}: {e}")
-    return None
+        log.warning("Binance funding failed: %s", e)
+        # cached like a success so one failed fetch covers the whole scan
+        return {}
+
+def get_binance_funding(symbol):
+    with cache_lock:
+        rates = cache['funding'].get('all')
+    if rates is None:
+        with funding_fetch_lock:
+            with cache_lock:
+                rates = cache['funding'].get('all')
+            if rates is None:
+                rates = _fetch_all_funding()
+                with cache_lock:
+                    cache['funding']['all'] = rates
+    return rates.get(symbol)
 
 # ==========================================
 # CLIENTS
@@ -92,7 +187,7 @@ def get_binance_funding(symbol):
 class CoinMarketCapClient:
     def __init__(self, api_key):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = make_session()
         if self.api_key:
             self.session.headers.update({
                 'X-CMC_PRO_API_KEY': self.api_key,
@@ -101,9 +196,9 @@ class CoinMarketCapClient:
 
     def get_quotes_latest(self, symbols):
         if not self.api_key:
-            print("CMC: no key")
+            log.debug("CMC: no key")
             return None
-        wait_for_rate_limit()
+        rate_limiter.acquire()
         try:
             params = {'symbol': symbols.upper(), 'convert': 'USD'}
             r = self.session.get(f"{CMC_URL}/v2/cryptocurrency/quotes/latest", params=params, timeout=10)
@@ -111,16 +206,16 @@ class CoinMarketCapClient:
             d = r.json()
             return d.get('data', {})
         except Exception as e:
-            print(f"❌ CMC error: {e}")
-            return {}
+            log.error("❌ CMC error: %s", e)
+            return None
 
 class EtherscanClient:
     def __init__(self, api_key):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = make_session()
 
     def _make_request(self, params):
-        wait_for_rate_limit()
+        rate_limiter.acquire()
         params['apikey'] = self.api_key
         try:
             response = self.session.get(ETHERSCAN_URL, params=params, timeout=10)
@@ -128,11 +223,13 @@ class EtherscanClient:
             data = response.json()
             if data.get('status') == '1':
                 return data.get('result')
+            elif data.get('message') == 'No transactions found':
+                return []
             else:
-                print(f"⚠️ Etherscan: {data.get('message')}")
+                log.warning("⚠️ Etherscan: %s", data.get('message'))
                 return None
         except Exception as e:
-            print(f"❌ Etherscan failed: {e}")
+            log.error("❌ Etherscan failed: %s", e)
             return None
 
     def get_whale_transactions(self, token_address, hours=24):
@@ -145,15 +242,36 @@ class EtherscanClient:
             return []
         blocks_per_hour = 300
         start_block = end_block - (blocks_per_hour * hours)
-        params = {
-            'module': 'account',
-            'action': 'tokentx',
-            'contractaddress': token_address,
-            'startblock': start_block,
-            'endblock': end_block,
-            'sort': 'desc'
-        }
-        return self._make_request(params) or []
+
+        # shard the range so each tokentx call stays under Etherscan's 10k result cap
+        step = (end_block - start_block + WHALE_SHARDS) // WHALE_SHARDS
+        futures = []
+        for hi in range(end_block, start_block - 1, -step):
+            params = {
+                'module': 'account',
+                'action': 'tokentx',
+                'contractaddress': token_address,
+                'startblock': max(start_block, hi - step + 1),
+                'endblock': hi,
+                'sort': 'desc'
+            }
+            futures.append(etherscan_executor.submit(self._make_request, params))
+
+        # a failed shard means partial coverage; return nothing so it isn't cached as fact
+        results = [future.result() for future in futures]
+        if any(result is None for result in results):
+            log.warning("⚠️ Etherscan: incomplete whale scan for %s, skipping", token_address)
+            return []
+
+        transactions = []
+        seen = set()
+        for result in results:
+            for tx in result:
+                key = (tx.get('hash'), tx.get('logIndex'))
+                if key not in seen:
+                    seen.add(key)
+                    transactions.append(tx)
+        return transactions
 
 # ==========================================
 # WHALE TRACKER
@@ -162,66 +280,75 @@ class WhaleTracker:
     def __init__(self, etherscan_client):
         self.client = etherscan_client
         self.whale_threshold_usd = 500000
-
-    def get_exchange_wallets(self):
-        return {
-            '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'.lower(),
-            '0xd551234ae421e3bcba99a0da6d736074f22192ff'.lower(),
-            '0x564286362092d8e7936f0549571a803b203aaced'.lower(),
-            '0x881d40237659c251811cec9c364ef91dc08d300c'.lower()
-        }
+        self.exchange_wallets = frozenset(addr.lower() for addr in (
+            '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be',
+            '0xd551234ae421e3bcba99a0da6d736074f22192ff',
+            '0x564286362092d8e7936f0549571a803b203aaced',
+            '0x881d40237659c251811cec9c364ef91dc08d300c'
+        ))
 
     def analyze_whale_flows(self, token_symbol, hours=24):
-        token_address = TOKEN_ADDRESSES.get(token_symbol.upper())
+        token_address = TOKEN_ADDRESSES.get(token_symbol)
         if not token_address:
             return {'net_flow': 0, 'buy_pressure': 0, 'sell_pressure': 0, 'whale_count': 0}
 
         cache_key = f"whale_{token_symbol}_{hours}"
-        now = time.time()
-        if cache_key in cache['whale_transactions']:
-            cached_data, timestamp = cache['whale_transactions'][cache_key]
-            if now - timestamp < 300:
-                return cached_data
+        try:
+            with cache_lock:
+                return cache['whale_transactions'][cache_key]
+        except KeyError:
+            pass
 
         transactions = self.client.get_whale_transactions(token_address, hours)
         if not transactions:
             return {'net_flow': 0, 'buy_pressure': 0, 'sell_pressure': 0, 'whale_count': 0}
 
-        net_flow = buy_pressure = sell_pressure = 0
-        whale_wallets = set()
-        exchange_wallets = self.get_exchange_wallets()
+        exchange_wallets = self.exchange_wallets
+        threshold = self.whale_threshold_usd
+        with cache_lock:
+            price = cache['prices'].get(token_symbol, {}).get('price', 2000)
 
+        # validate row by row so one malformed tx is skipped, not the whole batch
+        rows = []
         for tx in transactions:
             try:
-                value = int(tx.get('value', 0)) / 10**int(tx.get('tokenDecimal', 18))
-                from_addr = tx.get('from', '').lower()
-                to_addr = tx.get('to', '').lower()
-                price = cache['prices'].get(token_symbol, {}).get('price', 2000)
-                usd_value = value * price
-
-                if usd_value > self.whale_threshold_usd:
-                    whale_wallets.add(from_addr)
-                    whale_wallets.add(to_addr)
-
-                    if to_addr in exchange_wallets:
-                        sell_pressure += usd_value
-                        net_flow -= usd_value
-                    elif from_addr in exchange_wallets:
-                        buy_pressure += usd_value
-                        net_flow += usd_value
-            except Exception as e:
-                print(f"Transaction parse error: {e}")
-                continue
+                decimal = int(tx.get('tokenDecimal', 18))
+                if not 0 <= decimal < len(POW10):
+                    raise ValueError(f"tokenDecimal out of range: {decimal}")
+                rows.append((float(int(tx.get('value', 0))), decimal, tx.get('from', '').lower(), tx.get('to', '').lower()))
+            except (TypeError, ValueError, AttributeError, OverflowError) as e:
+                log.debug("Transaction parse error: %s", e)
+        if len(rows) < len(transactions):
+            log.warning("Skipped %d unparseable %s transactions", len(transactions) - len(rows), token_symbol)
+
+        n = len(rows)
+        values = np.fromiter((row[0] for row in rows), dtype=np.float64, count=n)
+        decimals = np.fromiter((row[1] for row in rows), dtype=np.intp, count=n)
+        from_addrs = [row[2] for row in rows]
+        to_addrs = [row[3] for row in rows]
+        from_is_ex = np.fromiter((a in exchange_wallets for a in from_addrs), dtype=bool, count=n)
+        to_is_ex = np.fromiter((a in exchange_wallets for a in to_addrs), dtype=bool, count=n)
+
+        usd = values / POW10[decimals] * price
+        mask = usd > threshold
+
+        # a transfer into an exchange counts as selling, even if it also left one
+        sell_pressure = float(usd[mask & to_is_ex].sum())
+        buy_pressure = float(usd[mask & from_is_ex & ~to_is_ex].sum())
+
+        whale_idx = np.flatnonzero(mask)
+        whale_wallets = {from_addrs[i] for i in whale_idx} | {to_addrs[i] for i in whale_idx}
 
         result = {
-            'net_flow': net_flow,
+            'net_flow': buy_pressure - sell_pressure,
             'buy_pressure': buy_pressure,
             'sell_pressure': sell_pressure,
             'whale_count': len(whale_wallets),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
 
-        cache['whale_transactions'][cache_key] = (result, now)
+        with cache_lock:
+            cache['whale_transactions'][cache_key] = result
         return result
 
 # ==========================================
@@ -230,68 +357,158 @@ class WhaleTracker:
 class DataAggregator:
     def __init__(self):
         self.cmc = CoinMarketCapClient(CMC_API_KEY)
-        self.cg_session = requests.Session()
+        self.cg_session = make_session()
         self.cg_base = 'https://api.coingecko.com/api/v3'
         self.whale_tracker = WhaleTracker(EtherscanClient(ETHERSCAN_API_KEY)) if ETHERSCAN_API_KEY else None
 
-    def get_price_data(self, symbol):
-        coin_id = symbol.upper()
-
-        # CMC priority
-        quotes = self.cmc.get_quotes_latest(coin_id)
-        if quotes and coin_id in quotes:
-            quote = quotes[coin_id][0]['quote']['USD']
+    def prefetch_prices(self, symbols):
+        with cache_lock:
+            missing = [s for s in symbols if s not in cache['prices'] and s not in cache['price_misses']]
+        if not missing:
+            return
+
+        # fetchers return None when the request itself failed; only a clean
+        # "not listed" answer from every source may mark a symbol as a miss
+        prices = self._fetch_cmc_prices(missing)
+        answered = prices is not None
+        prices = prices or {}
+        missing = [s for s in missing if s not in prices]
+        if missing:
+            cg_prices = self._fetch_coingecko_prices(missing)
+            answered = answered and cg_prices is not None
+            prices.update(cg_prices or {})
+            missing = [s for s in missing if s not in prices]
+
+        with cache_lock:
+            cache['prices'].update(prices)
+            if answered:
+                for symbol in missing:
+                    cache['price_misses'][symbol] = True
+        if missing:
+            log.warning("⚠️ No price data for %s", ', '.join(missing))
+
+    def _fetch_cmc_prices(self, symbols):
+        # CMC priority; without a key CMC simply has nothing to offer
+        if not self.cmc.api_key:
+            return {}
+        quotes = self.cmc.get_quotes_latest(','.join(symbols))
+        if quotes is None:
+            return None
+        prices = {}
+        for symbol in symbols:
+            quote = quotes[symbol][0]['quote']['USD'] if quotes.get(symbol) else {}
             price = quote.get('price')
-            if price is not None:
-                result = {
-                    'price': price,
-                    'change24h': quote.get('percent_change_24h', 0)
-                }
-                cache['prices'][symbol] = result
-                print(f"✅ CMC Price fetched: {symbol} = ${price:.2f}")
-                return result
-            else:
-                print(f"⚠️ CMC returned null price for {symbol}")
-
+            if price is None:
+                continue
+            prices[symbol] = {
+                'price': price,
+                'change24h': quote.get('percent_change_24h', 0)
+            }
+        log.debug("✅ CMC batch prices: %d/%d", len(prices), len(symbols))
+        return prices
+
+    def _fetch_coingecko_prices(self, symbols):
         # CoinGecko fallback
-        coin_id_lower = symbol.lower()
+        ids = {symbol.lower(): symbol for symbol in symbols}
         try:
-            url = f"{self.cg_base}/simple/price?ids={coin_id_lower}&vs_currencies=usd&include_24hr_change=true"
+            url = f"{self.cg_base}/simple/price?ids={','.join(ids)}&vs_currencies=usd&include_24hr_change=true"
             response = self.cg_session.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
-            if coin_id_lower in data and 'usd' in data[coin_id_lower]:
-                result = {
-                    'price': data[coin_id_lower]['usd'],
-                    'change24h': data[coin_id_lower].get('usd_24h_change', 0)
-                }
-                cache['prices'][symbol] = result
-                print(f"✅ CoinGecko fallback: {symbol} = ${result['price']:.2f}")
-                return result
         except Exception as e:
-            print(f"❌ CoinGecko fallback error for {symbol}: {e}")
+            log.error("❌ CoinGecko fallback error for %s: %s", ', '.join(symbols), e)
+            return None
+        prices = {
+            ids[coin_id]: {
+                'price': quote['usd'],
+                'change24h': quote.get('usd_24h_change', 0)
+            }
+            for coin_id, quote in data.items()
+            if coin_id in ids and 'usd' in quote
+        }
+        log.debug("✅ CoinGecko fallback: %d/%d", len(prices), len(symbols))
+        return prices
 
-        print(f"⚠️ No price data for {symbol}")
-        return None
+    def get_price_data(self, symbol):
+        with cache_lock:
+            cached = cache['prices'].get(symbol)
+        if cached:
+            return cached
+        self.prefetch_prices([symbol])
+        with cache_lock:
+            return cache['prices'].get(symbol)
 
     def aggregate_coin_data(self, symbol):
+        try:
+            with cache_lock:
+                return cache['coins'][symbol]
+        except KeyError:
+            pass
+
         price_data = self.get_price_data(symbol)
         if not price_data:
             return None
 
         funding = get_binance_funding(symbol)
 
-        whale_flows = self.whale_tracker.analyze_whale_flows(symbol) if self.whale_tracker and symbol.upper() in TOKEN_ADDRESSES else None
+        whale_flows = self.whale_tracker.analyze_whale_flows(symbol) if self.whale_tracker and symbol in TOKEN_SYMBOLS else None
 
-        return {
+        coin_data = {
             'symbol': symbol,
             'price': price_data['price'],
             'change24h': price_data['change24h'],
             'funding': funding,
             'whale_flows': whale_flows,
             'source': 'CMC' if CMC_API_KEY else 'CoinGecko',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
+        with cache_lock:
+            cache['coins'][symbol] = coin_data
+        return coin_data
+
+# ==========================================
+# SIGNAL BANDS
+# ==========================================
+# (threshold, {direction: template}) sorted by threshold; a band applies when the
+# value is strictly greater than its threshold. Templates are shared, so copy
+# before mutating.
+def _directional(label, score, risk, target, whale_prob):
+    return {
+        direction: {
+            'direction': direction,
+            'label': label[direction] if isinstance(label, dict) else label,
+            'score': score,
+            'risk': risk,
+            'target': target.format(move='up' if direction == 'LONG' else 'down'),
+            'whaleProb': whale_prob
+        }
+        for direction in ('LONG', 'SHORT')
+    }
+
+SCALP_BANDS = (
+    (0.005, _directional('LIGHT FUNDING BIAS', 55, 'LOW', '0.5-1.5% move', 60)),
+    (0.025, _directional('FUNDING PRESSURE', 70, 'MEDIUM', '1.5-2% {move}', 70)),
+    (0.05, _directional('EXTREME SQUEEZE', 90, 'HIGH', '2-3% {move}', 85)),
+)
+SCALP_THRESHOLDS = tuple(t for t, _ in SCALP_BANDS)
+
+# the 6-12% day band depends on BTC regime, not just direction
+DAY_REGIME_BAND = {}
+DAY_BANDS = (
+    (2, _directional('MILD MOMENTUM', 52, 'LOW', '1-3% {move}', 60)),
+    (6, DAY_REGIME_BAND),
+    (12, _directional({'LONG': 'BREAKOUT', 'SHORT': 'CAPITULATION'}, 80, 'HIGH', '4-6% {move}', 80)),
+)
+DAY_THRESHOLDS = tuple(t for t, _ in DAY_BANDS)
+
+BTC_BETA_PLAY = {'direction': 'LONG', 'label': 'BTC BETA PLAY', 'score': 65, 'risk': 'MEDIUM', 'target': '3-4% up', 'whaleProb': 65}
+DISTRIBUTION_SELL = {'direction': 'SHORT', 'label': 'DISTRIBUTION SELL', 'score': 65, 'risk': 'MEDIUM', 'target': '3-4% down', 'whaleProb': 65}
+POSITION_BUILD = {'direction': 'LONG', 'label': 'POSITION BUILD', 'score': 75, 'risk': 'MEDIUM', 'target': '15-30% up', 'whaleProb': 75}
+SWING_MOMENTUM = _directional('SWING MOMENTUM', 55, 'MEDIUM', '5-15% {move}', 65)
+
+def _pick_band(bands, thresholds, value):
+    idx = bisect_left(thresholds, value) - 1
+    return bands[idx][1] if idx >= 0 else None
 
 # ==========================================
 # SIGNAL GENERATOR (with mild fallback)
@@ -303,7 +520,7 @@ class SignalGenerator:
 
     def generate_signals(self, coin_data, timeframe):
         base_signal = self._generate_base_signal(coin_data, timeframe)
-        if coin_data['symbol'] in TOKEN_ADDRESSES and self.whale_tracker:
+        if coin_data['symbol'] in TOKEN_SYMBOLS and self.whale_tracker:
             whale_flows = coin_data.get('whale_flows')
             if whale_flows and whale_flows['whale_count'] > 0:
                 return self._enhance_with_whale_data(base_signal, whale_flows)
@@ -324,65 +541,19 @@ class SignalGenerator:
         }
 
         if timeframe == 'scalp' and funding is not None:
-            abs_funding = abs(funding)
-            if abs_funding > 0.05:
-                direction = 'SHORT' if funding > 0 else 'LONG'
-                signal = {
-                    'direction': direction,
-                    'label': 'EXTREME SQUEEZE',
-                    'score': 90,
-                    'risk': 'HIGH',
-                    'target': f"2-3% {'down' if funding > 0 else 'up'}",
-                    'whaleProb': 85
-                }
-            elif abs_funding > 0.025:
-                direction = 'SHORT' if funding > 0 else 'LONG'
-                signal = {
-                    'direction': direction,
-                    'label': 'FUNDING PRESSURE',
-                    'score': 70,
-                    'risk': 'MEDIUM',
-                    'target': f"1.5-2% {'down' if funding > 0 else 'up'}",
-                    'whaleProb': 70
-                }
-            elif abs_funding > 0.005:
-                direction = 'SHORT' if funding > 0 else 'LONG'
-                signal = {
-                    'direction': direction,
-                    'label': 'LIGHT FUNDING BIAS',
-                    'score': 55,
-                    'risk': 'LOW',
-                    'target': '0.5-1.5% move',
-                    'whaleProb': 60
-                }
+            band = _pick_band(SCALP_BANDS, SCALP_THRESHOLDS, abs(funding))
+            if band:
+                signal = dict(band['SHORT' if funding > 0 else 'LONG'])
 
         elif timeframe == 'day':
-            abs_change = abs(change24h)
-            if abs_change > 12:
-                direction = 'LONG' if change24h > 0 else 'SHORT'
-                signal = {
-                    'direction': direction,
-                    'label': 'BREAKOUT' if change24h > 0 else 'CAPITULATION',
-                    'score': 80,
-                    'risk': 'HIGH',
-                    'target': f"4-6% {'up' if change24h > 0 else 'down'}",
-                    'whaleProb': 80
-                }
-            elif abs_change > 6:
+            band = _pick_band(DAY_BANDS, DAY_THRESHOLDS, abs(change24h))
+            if band is DAY_REGIME_BAND:
                 if change24h > 0 and self.btc_regime == 'accumulation':
-                    signal = {'direction': 'LONG', 'label': 'BTC BETA PLAY', 'score': 65, 'risk': 'MEDIUM', 'target': '3-4% up', 'whaleProb': 65}
+                    signal = dict(BTC_BETA_PLAY)
                 elif change24h < 0 and self.btc_regime == 'distribution':
-                    signal = {'direction': 'SHORT', 'label': 'DISTRIBUTION SELL', 'score': 65, 'risk': 'MEDIUM', 'target': '3-4% down', 'whaleProb': 65}
-            elif abs_change > 2:
-                direction = 'LONG' if change24h > 0 else 'SHORT'
-                signal = {
-                    'direction': direction,
-                    'label': 'MILD MOMENTUM',
-                    'score': 52,
-                    'risk': 'LOW',
-                    'target': f"1-3% {'up' if change24h > 0 else 'down'}",
-                    'whaleProb': 60
-                }
+                    signal = dict(DISTRIBUTION_SELL)
+            elif band:
+                signal = dict(band['LONG' if change24h > 0 else 'SHORT'])
 
         elif timeframe == 'swing':
             if symbol == 'BTC':
@@ -396,17 +567,9 @@ class SignalGenerator:
                     'whaleProb': 95
                 }
             elif self.btc_regime == 'accumulation' and 5 < change24h < 15:
-                signal = {'direction': 'LONG', 'label': 'POSITION BUILD', 'score': 75, 'risk': 'MEDIUM', 'target': '15-30% up', 'whaleProb': 75}
+                signal = dict(POSITION_BUILD)
             elif abs(change24h) > 3:
-                direction = 'LONG' if change24h > 0 else 'SHORT'
-                signal = {
-                    'direction': direction,
-                    'label': 'SWING MOMENTUM',
-                    'score': 55,
-                    'risk': 'MEDIUM',
-                    'target': f"5-15% {'up' if change24h > 0 else 'down'}",
-                    'whaleProb': 65
-                }
+                signal = dict(SWING_MOMENTUM['LONG' if change24h > 0 else 'SHORT'])
 
         return signal
 
@@ -426,7 +589,7 @@ class SignalGenerator:
             'whale_flow': net_flow,
             'whale_count': whale_count
         }
-        print(f"Whale enhanced {signal['direction']} signal: {signal['score']}% → {enhanced['score']}%")
+        log.debug("Whale enhanced %s signal: %s%% → %s%%", signal['direction'], signal['score'], enhanced['score'])
         return enhanced
 
 # ==========================================
@@ -435,9 +598,83 @@ class SignalGenerator:
 aggregator = DataAggregator()
 signal_generator = SignalGenerator(aggregator.whale_tracker)
 
+# ==========================================
+# BACKGROUND SCANNER
+# ==========================================
+TIMEFRAMES = ('scalp', 'day', 'swing')
+SCAN_INTERVAL = int(os.getenv('SCAN_INTERVAL', 20))
+# matches the limit the dashboard polls with
+SCANNER_LIMIT = 30
+
+# timeframe -> {'payload', 'limit', 'scanned_at'}; entries are replaced, never mutated
+LATEST = {}
+latest_lock = threading.Lock()
+
+def scan_signals(timeframe, limit, threshold=40):
+    log.info("=== Scanning %s signals (threshold %d%%, limit %d) ===", timeframe.upper(), threshold, limit)
+
+    signals = []
+    errors = []
+
+    symbols = COIN_SYMBOLS[:limit]
+    aggregator.prefetch_prices(symbols)
+    futures = [scan_executor.submit(aggregator.aggregate_coin_data, s) for s in symbols]
+
+    # read back in COIN_SYMBOLS order so equal scores keep a stable order after the sort
+    for symbol, future in zip(symbols, futures):
+        log.debug("Processing %s...", symbol)
+        try:
+            coin_data = future.result()
+        except Exception as e:
+            log.error("❌ Aggregation failed for %s: %s", symbol, e)
+            coin_data = None
+        if coin_data:
+            signal = signal_generator.generate_signals(coin_data, timeframe)
+            log.debug("  → %s %s%%", signal['direction'], signal['score'])
+            # shallow copy, not coin_data['signal'] = ...: coin_data is the cache['coins']
+            # entry shared by every timeframe's snapshot
+            signals.append((signal['score'], {**coin_data, 'signal': signal}))  # show ALL for now
+        else:
+            errors.append(symbol)
+            log.debug("  → No data")
+
+    log.info("Complete: %d signals, %d errors", len(signals), len(errors))
+
+    signals.sort(key=itemgetter(0), reverse=True)
+
+    return {
+        'timeframe': timeframe,
+        'phase': signal_generator.btc_regime,
+        'signals': [entry for _, entry in signals],
+        'errors': errors,
+        'generated_at': now_iso()
+    }
+
+def scanner_loop():
+    while True:
+        for timeframe in TIMEFRAMES:
+            try:
+                payload = scan_signals(timeframe, SCANNER_LIMIT)
+            except Exception:
+                log.exception("Background scan failed for %s", timeframe)
+                continue
+            with latest_lock:
+                LATEST[timeframe] = {'payload': payload, 'limit': SCANNER_LIMIT, 'scanned_at': time.time()}
+        time.sleep(SCAN_INTERVAL)
+
+# started by the server entrypoint (__main__ / gunicorn post_worker_init), never on import,
+# so flask shell, scripts and the reloader parent don't hit upstream APIs
+def start_scanner():
+    if os.getenv('BACKGROUND_SCAN', '1') != '1':
+        return
+    threading.Thread(target=scanner_loop, name='signal-scanner', daemon=True).start()
+
 # ==========================================
 # ROUTES
 # ==========================================
+def ojson(obj, status=200):
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype='application/json')
+
 @app.route('/')
 def serve_frontend():
     return send_from_directory('.', 'index.html')
@@ -456,58 +693,50 @@ def debug_apis():
     except Exception as e:
         results['coingecko'] = {'status': 'Failed', 'error': str(e)}
     results['etherscan'] = 'Connected' if ETHERSCAN_API_KEY else 'Disabled'
-    return jsonify(results)
+    return ojson(results)
 
 @app.route('/api/signals/<timeframe>')
 def get_signals(timeframe):
-    if timeframe not in ['scalp', 'day', 'swing']:
-        return jsonify({'error': 'Invalid timeframe'}), 400
+    if timeframe not in TIMEFRAMES:
+        return ojson({'error': 'Invalid timeframe'}, 400)
 
     threshold = int(request.args.get('threshold', 40))  # lowered
     limit = int(request.args.get('limit', 20))
+    fresh = request.args.get('fresh') == '1'
 
-    print(f"\n=== Scanning {timeframe.upper()} signals (threshold {threshold}%, limit {limit}) ===")
+    with latest_lock:
+        snapshot = LATEST.get(timeframe)
 
-    signals = []
-    errors = []
-
-    for symbol in COIN_SYMBOLS[:limit]:
-        print(f"Processing {symbol}...")
-        coin_data = aggregator.aggregate_coin_data(symbol)
-        if coin_data:
-            signal = signal_generator.generate_signals(coin_data, timeframe)
-            print(f"  → {signal['direction']} {signal['score']}%")
-            signals.append({**coin_data, 'signal': signal})  # show ALL for now
-        else:
-            errors.append(symbol)
-            print("  → No data")
+    if fresh or not snapshot or limit > snapshot['limit']:
+        return ojson({**scan_signals(timeframe, limit, threshold), 'age': 0})
 
-    print(f"Complete: {len(signals)} signals, {len(errors)} errors")
-
-    return jsonify({
-        'timeframe': timeframe,
-        'phase': signal_generator.btc_regime,
-        'signals': sorted(signals, key=lambda x: x['signal']['score'], reverse=True),
-        'errors': errors,
-        'generated_at': datetime.now().isoformat()
-    })
+    payload = snapshot['payload']
+    if limit < snapshot['limit']:
+        wanted = set(COIN_SYMBOLS[:limit])
+        payload = {
+            **payload,
+            'signals': [entry for entry in payload['signals'] if entry['symbol'] in wanted],
+            'errors': [symbol for symbol in payload['errors'] if symbol in wanted]
+        }
+    return ojson({**payload, 'age': round(time.time() - snapshot['scanned_at'], 1)})
 
 @app.route('/api/coin/<symbol>')
 def get_single_coin(symbol):
-    coin_data = aggregator.aggregate_coin_data(symbol.upper())
+    symbol = symbol.upper()
+    coin_data = aggregator.aggregate_coin_data(symbol)
     if not coin_data:
-        return jsonify({'error': 'Coin not found'}), 404
+        return ojson({'error': 'Coin not found'}, 404)
 
     signals = {
         tf: signal_generator.generate_signals(coin_data, tf)
-        for tf in ['scalp', 'day', 'swing']
+        for tf in TIMEFRAMES
     }
 
-    return jsonify({
-        'symbol': symbol.upper(),
+    return ojson({
+        'symbol': symbol,
         'price_data': coin_data,
         'signals': signals,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now_iso()
     })
 
 if __name__ == '__main__':
@@ -517,6 +746,11 @@ if __name__ == '__main__':
     print(f"✅ Etherscan: {'Connected' if ETHERSCAN_API_KEY else 'DISABLED'}")
     print(f"✅ CMC: {'Connected' if CMC_API_KEY else 'DISABLED/Fallback'}")
     print(f"📊 Tracking {len(COIN_SYMBOLS)} coins | 🐋 Whale tokens: {len(TOKEN_ADDRESSES)}")
-    print("Open http://localhost:5000")
+    port = int(os.getenv('PORT', 5000))
+    print(f"Open http://localhost:{port}")
     print("="*60)
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    debug = os.getenv('FLASK_DEBUG') == '1'
+    # with the reloader on, only the serving child (WERKZEUG_RUN_MAIN) scans
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_scanner()
+    app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)
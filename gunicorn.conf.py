@@ -0,0 +1,17 @@
+# Production entrypoint: gunicorn -c gunicorn.conf.py app:app
+# The gevent worker monkey-patches sockets/threads before app.py is imported,
+# so the requests calls and the scan/Etherscan pools yield cooperatively.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = 'gevent'
+# one worker: caches, rate limiter and executors are per-process state
+workers = 1
+worker_connections = 100
+timeout = 120
+
+
+def post_worker_init(worker):
+    # app.py never starts the scanner on import; each serving worker starts its own
+    from app import start_scanner
+    start_scanner()